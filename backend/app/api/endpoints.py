@@ -1,4 +1,5 @@
-from fastapi import APIRouter, HTTPException
+import orjson
+from fastapi import APIRouter, HTTPException, Response
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 import numpy as np
@@ -63,23 +64,26 @@ def calculate_trajectory(request: CalculationRequest):
         raise HTTPException(status_code=400, detail="Target unreachable within physics constraints")
     
     traj_data = result['trajectory']
-    points = []
-    for i in range(len(traj_data['time'])):
-        points.append(TrajectoryPoint(
-            x=float(traj_data['x'][i]),
-            y=float(traj_data['y'][i]),
-            z=float(traj_data['z'][i]),
-            vx=float(traj_data['vx'][i]),
-            vy=float(traj_data['vy'][i]),
-            vz=float(traj_data['vz'][i]),
-            time=float(traj_data['time'][i])
-        ))
+    points = [
+        {"x": x, "y": y, "z": z, "vx": vx, "vy": vy, "vz": vz, "time": t}
+        for x, y, z, vx, vy, vz, t in zip(
+            traj_data['x'].tolist(),
+            traj_data['y'].tolist(),
+            traj_data['z'].tolist(),
+            traj_data['vx'].tolist(),
+            traj_data['vy'].tolist(),
+            traj_data['vz'].tolist(),
+            traj_data['time'].tolist()
+        )
+    ]
     
-    return CalculationResponse(
-        launch_angle=result['launch_angle'],
-        azimuth_angle=result['azimuth_angle'],
-        velocity=result['velocity'],
-        pullback=result['pullback'],
-        trajectory=points,
-        status="success"
-    )
+    # Returning a Response skips FastAPI's per-field response validation;
+    # CalculationResponse still documents the schema.
+    return Response(orjson.dumps({
+        "launch_angle": float(result['launch_angle']),
+        "azimuth_angle": float(result['azimuth_angle']),
+        "velocity": float(result['velocity']),
+        "pullback": float(result['pullback']),
+        "trajectory": points,
+        "status": "success"
+    }), media_type="application/json")
@@ -0,0 +1,247 @@
+import numpy as np
+from numba import njit, prange
+
+from app.physics.forces import drag_factor
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _acceleration(vx, vy, vz, w_x, w_z, drag_k, g):
+    rvx = vx - w_x
+    rvy = vy
+    rvz = vz - w_z
+    # F_drag / m = -drag_k * |v_rel| * v_rel, which is already zero at
+    # |v_rel| = 0, so no direction normalisation or zero-speed branch.
+    scale = -drag_k * np.sqrt(rvx * rvx + rvy * rvy + rvz * rvz)
+
+    return scale * rvx, -g + scale * rvy, scale * rvz
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _rk4_step(px, py, pz, pvx, pvy, pvz, w_x, w_z, drag_k, g, dt):
+    half_dt = 0.5 * dt
+
+    a1x, a1y, a1z = _acceleration(pvx, pvy, pvz, w_x, w_z,
+                                  drag_k, g)
+
+    v2x = pvx + half_dt * a1x
+    v2y = pvy + half_dt * a1y
+    v2z = pvz + half_dt * a1z
+    a2x, a2y, a2z = _acceleration(v2x, v2y, v2z, w_x, w_z,
+                                  drag_k, g)
+
+    v3x = pvx + half_dt * a2x
+    v3y = pvy + half_dt * a2y
+    v3z = pvz + half_dt * a2z
+    a3x, a3y, a3z = _acceleration(v3x, v3y, v3z, w_x, w_z,
+                                  drag_k, g)
+
+    v4x = pvx + dt * a3x
+    v4y = pvy + dt * a3y
+    v4z = pvz + dt * a3z
+    a4x, a4y, a4z = _acceleration(v4x, v4y, v4z, w_x, w_z,
+                                  drag_k, g)
+
+    nx = px + dt / 6.0 * (pvx + 2.0 * v2x + 2.0 * v3x + v4x)
+    ny = py + dt / 6.0 * (pvy + 2.0 * v2y + 2.0 * v3y + v4y)
+    nz = pz + dt / 6.0 * (pvz + 2.0 * v2z + 2.0 * v3z + v4z)
+    nvx = pvx + dt / 6.0 * (a1x + 2.0 * a2x + 2.0 * a3x + a4x)
+    nvy = pvy + dt / 6.0 * (a1y + 2.0 * a2y + 2.0 * a3y + a4y)
+    nvz = pvz + dt / 6.0 * (a1z + 2.0 * a2z + 2.0 * a3z + a4z)
+
+    return nx, ny, nz, nvx, nvy, nvz
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _grow(a, n):
+    out = np.empty(n)
+    out[:a.shape[0]] = a
+    return out
+
+
+@njit("(f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)",
+      cache=True, fastmath=True, nogil=True)
+def simulate_rk4(v0, theta, phi, w_x, w_z, rho, cd, area, mass, g,
+                 dt, max_time):
+    """Fixed-step RK4 flight from the origin, cut off where it lands (y = 0)."""
+    n_max = int(max_time / dt) + 1
+    drag_k = drag_factor(rho, cd, area, mass)
+
+    # Size the buffers for the drag-free flight time and grow on overrun,
+    # rather than allocating all of max_time for a flight that lands early.
+    vacuum_steps = int(2.0 * max(v0 * np.sin(theta), 0.0) / (g * dt)) + 16
+    n = min(n_max, vacuum_steps)
+
+    t = np.empty(n)
+    x = np.empty(n)
+    y = np.empty(n)
+    z = np.empty(n)
+    vx = np.empty(n)
+    vy = np.empty(n)
+    vz = np.empty(n)
+
+    px, py, pz = 0.0, 0.0, 0.0
+    pvx = v0 * np.cos(theta) * np.cos(phi)
+    pvy = v0 * np.sin(theta)
+    pvz = v0 * np.cos(theta) * np.sin(phi)
+
+    t[0] = 0.0
+    x[0], y[0], z[0] = px, py, pz
+    vx[0], vy[0], vz[0] = pvx, pvy, pvz
+
+    count = n_max
+
+    for i in range(1, n_max):
+        if i == n:
+            n = min(2 * n, n_max)
+            t = _grow(t, n)
+            x = _grow(x, n)
+            y = _grow(y, n)
+            z = _grow(z, n)
+            vx = _grow(vx, n)
+            vy = _grow(vy, n)
+            vz = _grow(vz, n)
+
+        nx, ny, nz, nvx, nvy, nvz = _rk4_step(px, py, pz, pvx, pvy, pvz,
+                                              w_x, w_z, drag_k, g, dt)
+
+        if ny < 0.0:
+            frac = py / (py - ny)
+            t[i] = (i - 1 + frac) * dt
+            x[i] = px + frac * (nx - px)
+            y[i] = 0.0
+            z[i] = pz + frac * (nz - pz)
+            vx[i] = pvx + frac * (nvx - pvx)
+            vy[i] = pvy + frac * (nvy - pvy)
+            vz[i] = pvz + frac * (nvz - pvz)
+            count = i + 1
+            break
+
+        t[i] = i * dt
+        x[i], y[i], z[i] = nx, ny, nz
+        vx[i], vy[i], vz[i] = nvx, nvy, nvz
+
+        px, py, pz = nx, ny, nz
+        pvx, pvy, pvz = nvx, nvy, nvz
+
+    return (t[:count], x[:count], y[:count], z[:count],
+            vx[:count], vy[:count], vz[:count])
+
+
+@njit("(f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)",
+      cache=True, fastmath=True, nogil=True)
+def simulate_endpoint(v0, theta, phi, w_x, w_z, rho, cd, area, mass, g,
+                      dt, max_time):
+    """Same flight as simulate_rk4, keeping only the state at landing.
+
+    Returns (x, z, vx, vy, vz, t) at the ground crossing, or at max_time if
+    the flight has not landed by then.
+    """
+    n = int(max_time / dt) + 1
+    drag_k = drag_factor(rho, cd, area, mass)
+
+    px, py, pz = 0.0, 0.0, 0.0
+    pvx = v0 * np.cos(theta) * np.cos(phi)
+    pvy = v0 * np.sin(theta)
+    pvz = v0 * np.cos(theta) * np.sin(phi)
+
+    for i in range(1, n):
+        nx, ny, nz, nvx, nvy, nvz = _rk4_step(px, py, pz, pvx, pvy, pvz,
+                                              w_x, w_z, drag_k, g, dt)
+
+        if ny < 0.0:
+            frac = py / (py - ny)
+            return (px + frac * (nx - px),
+                    pz + frac * (nz - pz),
+                    pvx + frac * (nvx - pvx),
+                    pvy + frac * (nvy - pvy),
+                    pvz + frac * (nvz - pvz),
+                    (i - 1 + frac) * dt)
+
+        px, py, pz = nx, ny, nz
+        pvx, pvy, pvz = nvx, nvy, nvz
+
+    return px, pz, pvx, pvy, pvz, (n - 1) * dt
+
+
+# Launches per lockstep group in simulate_batch_parallel. Interleaving a
+# few dozen independent flights hides the latency of each RK4 step chain.
+BATCH_CHUNK = 64
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _lockstep_landings(v0, theta, phi, w_x, w_z, drag_k, g, dt, n):
+    k = v0.shape[0]
+
+    px = np.zeros(k)
+    py = np.zeros(k)
+    pz = np.zeros(k)
+    pvx = v0 * np.cos(theta) * np.cos(phi)
+    pvy = v0 * np.sin(theta)
+    pvz = v0 * np.cos(theta) * np.sin(phi)
+
+    active = np.ones(k, dtype=np.bool_)
+    remaining = k
+
+    for i in range(1, n):
+        for j in range(k):
+            if not active[j]:
+                continue
+
+            nx, ny, nz, nvx, nvy, nvz = _rk4_step(
+                px[j], py[j], pz[j], pvx[j], pvy[j], pvz[j],
+                w_x, w_z, drag_k, g, dt
+            )
+
+            if ny < 0.0:
+                frac = py[j] / (py[j] - ny)
+                px[j] = px[j] + frac * (nx - px[j])
+                py[j] = 0.0
+                pz[j] = pz[j] + frac * (nz - pz[j])
+                active[j] = False
+                remaining -= 1
+                continue
+
+            px[j], py[j], pz[j] = nx, ny, nz
+            pvx[j], pvy[j], pvz[j] = nvx, nvy, nvz
+
+        if remaining == 0:
+            break
+
+    return px, pz
+
+
+@njit("UniTuple(f8[::1], 2)(f8[::1], f8, f8[::1], f8, f8, f8, f8, f8, f8, f8, f8, f8)",
+      cache=True, fastmath=True, nogil=True)
+def simulate_batch_rk4(v0, theta, phi, w_x, w_z, rho, cd, area, mass, g,
+                       dt, max_time):
+    """Step K launches (arrays v0, phi) in lockstep; return landing x and z."""
+    return _lockstep_landings(v0, theta, phi, w_x, w_z,
+                              drag_factor(rho, cd, area, mass), g, dt,
+                              int(max_time / dt) + 1)
+
+
+# No eager signature: this is the most expensive kernel to compile and only
+# sweeps call it, so it compiles (or loads from cache) on first use.
+@njit(cache=True, fastmath=True, nogil=True, parallel=True)
+def simulate_batch_parallel(v0, theta, phi, w_x, w_z, rho, cd, area, mass, g,
+                            dt, max_time):
+    """Landing x and z of each launch in the v0/theta/phi arrays.
+
+    Launches are split into lockstep groups of BATCH_CHUNK spread across
+    cores.
+    """
+    k = v0.shape[0]
+    n = int(max_time / dt) + 1
+    drag_k = drag_factor(rho, cd, area, mass)
+    final_x = np.empty(k)
+    final_z = np.empty(k)
+
+    for c in prange((k + BATCH_CHUNK - 1) // BATCH_CHUNK):
+        lo = c * BATCH_CHUNK
+        hi = min(lo + BATCH_CHUNK, k)
+        x, z = _lockstep_landings(v0[lo:hi], theta[lo:hi], phi[lo:hi],
+                                  w_x, w_z, drag_k, g, dt, n)
+        final_x[lo:hi] = x
+        final_z[lo:hi] = z
+
+    return final_x, final_z
@@ -0,0 +1,50 @@
+"""Ahead-of-time build of the Numba kernels the request path calls directly.
+
+Run from the backend directory before starting the server:
+
+    python -m app.physics._integrator_aot
+
+This writes a ``trajectory_aot`` extension next to this file. trajectory.py
+and solver.py import from it when present and only import the JIT integrator
+and optimizer modules when it is missing, so startup skips compiling them.
+The exported solve holds the GIL, so with the extension the solver sweeps
+angles in the calling thread; use Solver(use_processes=True) to spread a
+sweep over cores.
+"""
+import os
+import numpy as np
+from numba.pycc import CC
+
+from app.physics._integrator import simulate_rk4 as _simulate_rk4_jit
+from app.physics._optimizer import solve_launch_lm as _solve_launch_lm_jit
+
+cc = CC('trajectory_aot')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+# Exported functions cannot return a tuple of arrays, so the seven columns
+# come back as rows of one array; callers unpack both forms the same way.
+@cc.export('simulate_rk4', 'f8[:,:](f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)')
+def simulate_rk4(v0, theta, phi, w_x, w_z, rho, cd, area, mass, g, dt,
+                 max_time):
+    columns = _simulate_rk4_jit(v0, theta, phi, w_x, w_z, rho, cd, area,
+                                mass, g, dt, max_time)
+    out = np.empty((7, columns[0].shape[0]))
+    for i in range(7):
+        out[i] = columns[i]
+    return out
+
+
+@cc.export('solve_launch_lm',
+           'Tuple((f8, f8, f8, i8))(f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, '
+           'f8, f8, f8, f8, f8, f8, f8, f8, i8, f8, f8, f8)')
+def solve_launch_lm(v0, az_deg, theta, tx, tz, w_x, w_z, rho, cd, area,
+                    mass, g, dt, max_time, v_min, v_max, az_min, az_max,
+                    max_nfev, ftol, xtol, atol):
+    return _solve_launch_lm_jit(v0, az_deg, theta, tx, tz, w_x, w_z, rho, cd,
+                                area, mass, g, dt, max_time, v_min, v_max,
+                                az_min, az_max, max_nfev, ftol, xtol, atol)
+
+
+if __name__ == "__main__":
+    cc.compile()
@@ -0,0 +1,115 @@
+import numpy as np
+from numba import njit
+
+from app.physics._integrator import simulate_endpoint, simulate_batch_rk4
+
+FD_STEP = np.sqrt(np.finfo(np.float64).eps)
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _landing_residual(v0, az_deg, theta, tx, tz, w_x, w_z, rho, cd, area,
+                      mass, g, dt, max_time):
+    x, z, vx, vy, vz, t = simulate_endpoint(
+        v0, theta, np.radians(az_deg), w_x, w_z, rho, cd, area, mass, g,
+        dt, max_time
+    )
+    return x - tx, z - tz
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _fd_jacobian(v0, az_deg, theta, w_x, w_z, rho, cd, area, mass, g, dt,
+                 max_time):
+    h_v = FD_STEP * max(1.0, abs(v0))
+    h_az = FD_STEP * max(1.0, abs(az_deg))
+
+    v = np.array([v0, v0 + h_v, v0])
+    phi = np.radians(np.array([az_deg, az_deg, az_deg + h_az]))
+    final_x, final_z = simulate_batch_rk4(v, theta, phi, w_x, w_z, rho, cd,
+                                          area, mass, g, dt, max_time)
+
+    return ((final_x[1] - final_x[0]) / h_v,
+            (final_x[2] - final_x[0]) / h_az,
+            (final_z[1] - final_z[0]) / h_v,
+            (final_z[2] - final_z[0]) / h_az)
+
+
+@njit("Tuple((f8, f8, f8, i8))(f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, "
+      "f8, f8, f8, f8, f8, f8, i8, f8, f8, f8)",
+      cache=True, fastmath=True, nogil=True)
+def solve_launch_lm(v0, az_deg, theta, tx, tz, w_x, w_z, rho, cd, area,
+                    mass, g, dt, max_time, v_min, v_max, az_min, az_max,
+                    max_nfev, ftol, xtol, atol):
+    """Levenberg-Marquardt fit of (v0, azimuth) so the flight lands on (tx, tz).
+
+    The Jacobian starts from one batched finite difference and is then kept
+    current with Broyden secant updates from every trial point. Stops once
+    the landing miss is below atol metres.
+    """
+    v = min(max(v0, v_min), v_max)
+    az = min(max(az_deg, az_min), az_max)
+
+    rx, rz = _landing_residual(v, az, theta, tx, tz, w_x, w_z, rho, cd,
+                               area, mass, g, dt, max_time)
+    j00, j01, j10, j11 = _fd_jacobian(v, az, theta, w_x, w_z, rho, cd,
+                                      area, mass, g, dt, max_time)
+    nfev = 4
+    cost = rx * rx + rz * rz
+    lam = 1e-3
+    fresh_jac = True
+
+    while nfev < max_nfev and cost > atol * atol:
+        a00 = j00 * j00 + j10 * j10
+        a01 = j00 * j01 + j10 * j11
+        a11 = j01 * j01 + j11 * j11
+        g0 = j00 * rx + j10 * rz
+        g1 = j01 * rx + j11 * rz
+
+        d00 = a00 * (1.0 + lam) + 1e-12
+        d11 = a11 * (1.0 + lam) + 1e-12
+        det = d00 * d11 - a01 * a01
+        step_v = (-g0 * d11 + g1 * a01) / det
+        step_az = (-g1 * d00 + g0 * a01) / det
+
+        v_new = min(max(v + step_v, v_min), v_max)
+        az_new = min(max(az + step_az, az_min), az_max)
+        dv = v_new - v
+        daz = az_new - az
+
+        if abs(dv) <= xtol * (xtol + abs(v)) and abs(daz) <= xtol * (xtol + abs(az)):
+            break
+
+        rx_new, rz_new = _landing_residual(v_new, az_new, theta, tx, tz,
+                                           w_x, w_z, rho, cd, area, mass, g,
+                                           dt, max_time)
+        nfev += 1
+
+        # Broyden update: make the Jacobian reproduce the observed change.
+        step_sq = dv * dv + daz * daz
+        ex = (rx_new - rx) - (j00 * dv + j01 * daz)
+        ez = (rz_new - rz) - (j10 * dv + j11 * daz)
+        j00 += ex * dv / step_sq
+        j01 += ex * daz / step_sq
+        j10 += ez * dv / step_sq
+        j11 += ez * daz / step_sq
+
+        cost_new = rx_new * rx_new + rz_new * rz_new
+        if cost_new < cost:
+            reduction = cost - cost_new
+            v, az = v_new, az_new
+            rx, rz = rx_new, rz_new
+            cost = cost_new
+            lam = max(lam * 0.1, 1e-12)
+            fresh_jac = False
+            if reduction <= ftol * cost:
+                break
+        else:
+            lam *= 10.0
+            if lam > 1e4 and not fresh_jac:
+                j00, j01, j10, j11 = _fd_jacobian(v, az, theta, w_x, w_z,
+                                                  rho, cd, area, mass, g,
+                                                  dt, max_time)
+                nfev += 3
+                lam = 1e-3
+                fresh_jac = True
+
+    return v, az, np.sqrt(cost), nfev
@@ -9,3 +9,8 @@ DRAG_COEFFICIENT = 0.47
 
 WIND_SPEED = 0.0
 WIND_DIRECTION_DEG = 0.0
+
+SIMULATION_TIME_STEP = 0.01
+SOLVER_TIME_STEP = 0.05
+MAX_FLIGHT_TIME = 20.0
+LANDING_TOLERANCE = 1e-4
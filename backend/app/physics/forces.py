@@ -1,10 +1,64 @@
+import math
 import numpy as np
+from numba import njit
 from app.physics.constants import (
     AIR_DENSITY,
     DRAG_COEFFICIENT,
     KINEMATIC_VISCOSITY
 )
 
+RE_TABLE_LOG10_MIN = -2.0
+RE_TABLE_LOG10_MAX = 7.0
+RE_TABLE_SIZE = 1024
+
+def _drag_coefficient_exact(reynolds_number):
+    if reynolds_number < 1:
+        return 24 / (reynolds_number + 1e-6)
+    elif reynolds_number < 1000:
+        return 24 / (reynolds_number + 1e-6) + 4 / math.sqrt(reynolds_number + 1e-6) + 0.4
+    else:
+        return 0.47
+
+_RE_TABLE_SCALE = (RE_TABLE_SIZE - 1) / (RE_TABLE_LOG10_MAX - RE_TABLE_LOG10_MIN)
+_CD_TABLE = np.array([
+    _drag_coefficient_exact(re)
+    for re in np.logspace(RE_TABLE_LOG10_MIN, RE_TABLE_LOG10_MAX, RE_TABLE_SIZE)
+])
+
+@njit(cache=True)
+def lookup_drag_coefficient(reynolds_number):
+    if reynolds_number < 10.0**RE_TABLE_LOG10_MIN:
+        return 24 / (reynolds_number + 1e-6)
+
+    pos = (np.log10(reynolds_number) - RE_TABLE_LOG10_MIN) * _RE_TABLE_SCALE
+    if pos >= RE_TABLE_SIZE - 1:
+        return _CD_TABLE[RE_TABLE_SIZE - 1]
+
+    i = int(pos)
+    frac = pos - i
+    return _CD_TABLE[i] + frac * (_CD_TABLE[i + 1] - _CD_TABLE[i])
+
+@njit(cache=True)
+def drag_force(velocity_magnitude, cross_sectional_area, air_density,
+               drag_coefficient):
+    return 0.5 * air_density * (velocity_magnitude**2) * \
+           drag_coefficient * cross_sectional_area
+
+@njit(cache=True)
+def drag_factor(air_density, drag_coefficient, cross_sectional_area, mass):
+    """Drag deceleration per unit speed squared: |a_drag| = drag_factor * v**2."""
+    return drag_force(1.0, cross_sectional_area, air_density, drag_coefficient) / mass
+
+@njit("UniTuple(f8, 2)(f8, f8)", cache=True)
+def wind_components(wind_speed, wind_direction_rad):
+    return (wind_speed * np.cos(wind_direction_rad),
+            wind_speed * np.sin(wind_direction_rad))
+
+@njit(cache=True)
+def reynolds_number(velocity_magnitude, diameter,
+                    kinematic_viscosity=KINEMATIC_VISCOSITY):
+    return velocity_magnitude * diameter / kinematic_viscosity
+
 class ForceCalculator:
     
     def __init__(self, air_density=AIR_DENSITY, 
@@ -17,20 +71,15 @@ class ForceCalculator:
         rho = air_density if air_density is not None else self.air_density
         cd = drag_coefficient if drag_coefficient is not None else self.drag_coefficient
         
-        drag_force = 0.5 * rho * (velocity_magnitude**2) * \
-                     cd * cross_sectional_area
-        return drag_force
+        return drag_force(velocity_magnitude, cross_sectional_area, rho, cd)
     
     def calculate_wind_force(self, wind_speed, wind_direction_rad):
-        wind_x = wind_speed * np.cos(wind_direction_rad)
-        wind_z = wind_speed * np.sin(wind_direction_rad)
+        wind_x, wind_z = wind_components(float(wind_speed), float(wind_direction_rad))
         return np.array([wind_x, 0, wind_z])
 
+    def calculate_reynolds_number(self, velocity_magnitude, diameter):
+        return reynolds_number(velocity_magnitude, diameter)
+
     @staticmethod
     def get_drag_coefficient(reynolds_number):
-        if reynolds_number < 1:
-            return 24 / (reynolds_number + 1e-6)
-        elif reynolds_number < 1000:
-            return 24 / (reynolds_number + 1e-6) + 4 / np.sqrt(reynolds_number + 1e-6) + 0.4
-        else:
-            return 0.47
+        return lookup_drag_coefficient(float(reynolds_number))
@@ -1,11 +1,141 @@
+import functools
+import logging
+import math
+import multiprocessing
+import os
+import threading
 import numpy as np
-from scipy.optimize import least_squares
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 from app.physics.trajectory import TrajectoryCalculator
-from app.physics.constants import WATER_BALLOON_MASS
+from app.physics.constants import (
+    EARTH_GRAVITY,
+    WATER_BALLOON_MASS,
+    SIMULATION_TIME_STEP,
+    SOLVER_TIME_STEP,
+    MAX_FLIGHT_TIME,
+    LANDING_TOLERANCE
+)
+
+# The AOT build holds the GIL, so with it the angle sweep runs in the calling
+# thread; the JIT kernel releases it and the sweep uses the thread pool.
+try:
+    from app.physics.trajectory_aot import solve_launch_lm
+    _SOLVE_RELEASES_GIL = False
+except ImportError:
+    from app.physics._optimizer import solve_launch_lm
+    _SOLVE_RELEASES_GIL = True
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# A previous solution at the same angle and environment seeds the fit when
+# its target lies within this fraction of the new target's distance.
+WARM_START_RADIUS = 0.2
+
+# Landing miss (m) below which a fit counts as a hit.
+HIT_TOLERANCE = 0.5
+
+def _quantize(values, ndigits=2):
+    return tuple(None if v is None else round(float(v), ndigits) for v in values)
+
+# Sweeps over wind or air properties for a fixed target reuse the guesses.
+@functools.lru_cache(maxsize=1024)
+def _initial_speed_guesses(angles, dist):
+    """Drag-free launch speed reaching dist at each angle (50 m/s if none)."""
+    denom = np.sin(2 * np.radians(np.asarray(angles, dtype=float)))
+    denom = np.where(np.abs(denom) < 1e-4, 1e-4, denom)
+    with np.errstate(invalid='ignore'):
+        v_guesses = np.sqrt(dist * EARTH_GRAVITY / denom)
+    return tuple(np.where(np.isnan(v_guesses) | (v_guesses > 300), 50.0, v_guesses).tolist())
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+def _get_process_pool(max_workers):
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            # Spawn rather than fork: Numba's threading layer does not
+            # survive being forked from an initialised parent.
+            _process_pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _process_pool
+
+_worker_solver = None
+
+def _solve_angle_in_worker(angle, v_guess, target_pos, resolved_env, solve_dt,
+                           landing_tol):
+    global _worker_solver
+    if (_worker_solver is None or _worker_solver.solve_dt != solve_dt
+            or _worker_solver.landing_tol != landing_tol):
+        _worker_solver = Solver(max_workers=1, solve_dt=solve_dt,
+                                landing_tol=landing_tol)
+    return _worker_solver._solve_params_for_angle_robust(
+        angle, target_pos, v_guess, resolved_env
+    )
+
+class _LRUCache:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=_MISSING):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
 
 class Solver:
-    def __init__(self):
+    def __init__(self, angle_cache_size=256, solution_cache_size=1024,
+                 max_workers=None, solve_dt=SOLVER_TIME_STEP,
+                 trajectory_dt=SIMULATION_TIME_STEP, landing_tol=LANDING_TOLERANCE,
+                 use_processes=False):
         self.traj_calc = TrajectoryCalculator()
+        self.max_workers = max_workers or os.cpu_count()
+        self.use_processes = use_processes
+        self.solve_dt = solve_dt
+        self.trajectory_dt = trajectory_dt
+        self.landing_tol = landing_tol
+        self._angle_cache = _LRUCache(angle_cache_size)
+        self._solution_cache = _LRUCache(solution_cache_size)
+        self._warm_starts = _LRUCache(angle_cache_size)
+        # Created on first threaded sweep; AOT and process-pool sweeps never
+        # need it.
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shut down this solver's thread pool, if one was started."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            return self._executor
         
     def find_optimal_trajectory(self, target_pos, spring_constant, 
                                 env_params=None,
@@ -13,133 +143,162 @@ class Solver:
         env = env_params or {}
         tx, ty, tz = target_pos
         
+        # Wind components and air properties are fixed for the whole sweep.
+        resolved_env = self.traj_calc.resolve_environment(
+            env.get('wind_speed', 0), env.get('wind_direction', 0),
+            env.get('air_density'), env.get('drag_coefficient')
+        )
+        
+        # Only the target is rounded: a centimetre shift barely moves the
+        # landing point, while small changes to the physics can move it by
+        # metres. The spring constant only scales the pullback, so it is
+        # left out of the key and applied to cached and fresh solutions alike.
+        solution_key = (_quantize((tx, ty, tz)) + resolved_env
+                        + (tuple(angle_range), angle_step))
+        cached = self._solution_cache.get(solution_key)
+        if cached is not _MISSING:
+            return self._with_pullback(cached, spring_constant)
+        
         best_solution = None
         min_velocity = float('inf')
         
         global_min_error = float('inf')
         global_best_solution = None
         
-        for angle in range(angle_range[0], angle_range[1] + 1, angle_step):
-            
-            result = self._solve_params_for_angle_robust(
-                angle, target_pos, env_params=env
+        angles = range(angle_range[0], angle_range[1] + 1, angle_step)
+        v_guesses = _initial_speed_guesses(angles, round(math.hypot(tx, tz), 3))
+        if self.use_processes:
+            # Angles go out in one chunk per worker to amortize the IPC.
+            results = _get_process_pool(self.max_workers).map(
+                _solve_angle_in_worker,
+                angles, v_guesses, repeat(target_pos), repeat(resolved_env),
+                repeat(self.solve_dt), repeat(self.landing_tol),
+                chunksize=-(-len(angles) // self.max_workers)
             )
+        else:
+            results = (self._get_executor().map if _SOLVE_RELEASES_GIL else map)(
+                lambda angle, v_guess: self._solve_params_for_angle_robust(
+                    angle, target_pos, v_guess, resolved_env
+                ),
+                angles, v_guesses
+            )
+        
+        for angle, result in zip(angles, results):
             
             if result:
-                v0, az, solution_error, sim = result
-                
-                pullback = v0 * np.sqrt(WATER_BALLOON_MASS / spring_constant)
-                
-                current_solution = {
-                    "launch_angle": angle,
-                    "azimuth_angle": az,
-                    "velocity": v0,
-                    "pullback": pullback,
-                    "trajectory": sim,
-                    "error": solution_error
-                }
+                v0, az, solution_error = result
+                current_solution = (angle, v0, az)
 
                 if solution_error < global_min_error:
                     global_min_error = solution_error
                     global_best_solution = current_solution
                 
-                if solution_error < 0.5:
+                if solution_error < HIT_TOLERANCE:
                     if v0 < min_velocity:
                         min_velocity = v0
                         best_solution = current_solution
         
-        if best_solution:
-            return best_solution
-            
-        if global_best_solution:
-            print(f"Warning: Could not hit target perfectly. Best error: {global_min_error:.2f}m")
-        return global_best_solution
+        if best_solution is None and global_best_solution:
+            logger.warning("Could not hit target perfectly. Best error: %.2fm", global_min_error)
+        
+        chosen = best_solution or global_best_solution
+        solution = None
+        if chosen:
+            solution = self._build_solution(chosen, target_pos, env)
+        
+        self._solution_cache.put(solution_key, solution)
+        return self._with_pullback(solution, spring_constant)
 
-    def _solve_params_for_angle_robust(self, angle, target_pos, env_params=None):
+    @staticmethod
+    def _with_pullback(solution, spring_constant):
+        if solution is None:
+            return None
+        # np.sqrt gives NaN (serialised as null) for a non-physical negative
+        # spring constant instead of raising like math.sqrt.
+        return dict(solution, pullback=solution["velocity"] * np.sqrt(
+            WATER_BALLOON_MASS / spring_constant
+        ))
+
+    def _build_solution(self, chosen, target_pos, env):
+        angle, v0, az = chosen
         tx, ty, tz = target_pos
-        env = env_params or {}
         
-        wind_speed = env.get('wind_speed', 0)
-        wind_dir = env.get('wind_direction', 0)
-        air_density = env.get('air_density')
-        drag_coeff = env.get('drag_coefficient')
-
-        geom_azimuth = np.degrees(np.arctan2(tz, tx))
+        sim = self.traj_calc.simulate(
+            v0=v0,
+            launch_angle_deg=angle,
+            azimuth_deg=az,
+            wind_speed=env.get('wind_speed', 0),
+            wind_direction_deg=env.get('wind_direction', 0),
+            air_density=env.get('air_density'),
+            drag_coefficient=env.get('drag_coefficient'),
+            dt=self.trajectory_dt
+        )
         
-        dist = np.sqrt(tx**2 + tz**2)
-        g = 9.81
-        rad_angle = np.radians(angle)
+        final_x = sim['x'][-1]
+        final_z = sim['z'][-1]
         
-        try:
-            denom = np.sin(2 * rad_angle)
-            if abs(denom) < 1e-4: denom = 1e-4
-            v_guess = np.sqrt(dist * g / denom)
-        except:
-            v_guess = 50.0 
-            
-        if np.isnan(v_guess) or v_guess > 300: v_guess = 50.0
+        return {
+            "launch_angle": angle,
+            "azimuth_angle": az,
+            "velocity": v0,
+            "trajectory": sim,
+            "error": math.hypot(final_x - tx, final_z - tz)
+        }
+
+    def _solve_params_for_angle_robust(self, angle, target_pos, v_guess,
+                                       resolved_env):
+        tx, ty, tz = target_pos
+
+        cache_key = (angle, tx, ty, tz) + resolved_env
+        cached = self._angle_cache.get(cache_key)
+        if cached is not _MISSING:
+            return cached
+
+        result = self._solve_params_for_angle_uncached(
+            angle, target_pos, v_guess, resolved_env,
+            warm_start=self._warm_starts.get((angle,) + resolved_env, None)
+        )
+        self._angle_cache.put(cache_key, result)
+        if result and result[2] < HIT_TOLERANCE:
+            self._warm_starts.put((angle,) + resolved_env, (tx, tz, result[0], result[1]))
+        return result
+
+    def _solve_params_for_angle_uncached(self, angle, target_pos, v_guess,
+                                         resolved_env, warm_start=None):
+        tx, ty, tz = target_pos
+
+        geom_azimuth = math.degrees(math.atan2(tz, tx))
+        
+        dist = math.hypot(tx, tz)
+        rad_angle = math.radians(angle)
         
         x0 = [v_guess * 1.1, geom_azimuth]
         
-        bounds = (
-            [1.0, geom_azimuth - 120], 
-            [300.0, geom_azimuth + 120]
-        )
-
-        def residuals(params):
-            v_curr, az_curr = params
-            
-            sim = self.traj_calc.simulate(
-                v0=v_curr,
-                launch_angle_deg=angle,
-                azimuth_deg=az_curr,
-                wind_speed=wind_speed,
-                wind_direction_deg=wind_dir,
-                air_density=air_density,
-                drag_coefficient=drag_coeff,
-                dt=0.01,
-                max_time=20.0
-            )
-            
-            final_x = sim['x'][-1]
-            final_z = sim['z'][-1]
-            
-            res_x = final_x - tx
-            res_z = final_z - tz
-            
-            return [res_x, res_z]
-
-        try:
-            res = least_squares(
-                residuals, 
-                x0, 
-                bounds=bounds, 
-                ftol=1e-6,
-                xtol=1e-6,
-                loss='linear',
-                max_nfev=100 
-            )
-        except Exception as e:
-            return None
-            
-        best_v, best_az = res.x
+        if warm_start is not None:
+            prev_tx, prev_tz, prev_v, prev_az = warm_start
+            prev_dist = math.hypot(prev_tx, prev_tz)
+            shift = math.hypot(tx - prev_tx, tz - prev_tz)
+            if prev_dist > 0 and shift < WARM_START_RADIUS * dist:
+                turn = geom_azimuth - math.degrees(math.atan2(prev_tz, prev_tx))
+                # Wrap onto the branch centred on geom_azimuth so the start
+                # lies inside the fit's azimuth bounds across the -x axis.
+                offset = (prev_az + turn - geom_azimuth + 180) % 360 - 180
+                x0 = [prev_v * math.sqrt(dist / prev_dist), geom_azimuth + offset]
         
-        final_sim = self.traj_calc.simulate(
-            v0=best_v,
-            launch_angle_deg=angle,
-            azimuth_deg=best_az,
-            wind_speed=wind_speed,
-            wind_direction_deg=wind_dir,
-            air_density=air_density,
-            drag_coefficient=drag_coeff,
-            dt=0.01
+        w_x, w_z, rho, cd = resolved_env
+
+        best_v, best_az, dist_err, _ = solve_launch_lm(
+            float(x0[0]), float(x0[1]), float(rad_angle),
+            float(tx), float(tz),
+            w_x, w_z, rho, cd,
+            float(self.traj_calc.area), float(self.traj_calc.mass), EARTH_GRAVITY,
+            float(self.solve_dt), MAX_FLIGHT_TIME,
+            1.0, 300.0,
+            float(geom_azimuth - 120), float(geom_azimuth + 120),
+            100, 1e-6, 1e-6, float(self.landing_tol)
         )
         
-        final_x = final_sim['x'][-1]
-        final_z = final_sim['z'][-1]
-        dist_err = np.sqrt((final_x - tx)**2 + (final_z - tz)**2)
-        
         if dist_err > 100.0:
             return None
             
-        return best_v, best_az, dist_err, final_sim
+        return best_v, best_az, dist_err
@@ -1,83 +1,93 @@
+import math
 import numpy as np
-from scipy.integrate import solve_ivp
 from app.physics.constants import (
     EARTH_GRAVITY,
     BALLOON_RADIUS,
-    WATER_BALLOON_MASS
+    WATER_BALLOON_MASS,
+    SIMULATION_TIME_STEP,
+    MAX_FLIGHT_TIME
 )
-from app.physics.forces import ForceCalculator
+from app.physics.forces import ForceCalculator, wind_components
+
+try:
+    from app.physics.trajectory_aot import simulate_rk4
+except ImportError:
+    from app.physics._integrator import simulate_rk4
 
 class TrajectoryCalculator:
     def __init__(self, mass=WATER_BALLOON_MASS, radius=BALLOON_RADIUS):
         self.mass = mass
         self.radius = radius
-        self.area = np.pi * radius**2
+        self.area = math.pi * radius**2
         self.force_calc = ForceCalculator()
 
+    def resolve_environment(self, wind_speed, wind_direction_deg,
+                             air_density, drag_coefficient):
+        w_x, w_z = wind_components(
+            float(wind_speed), math.radians(wind_direction_deg)
+        )
+        
+        rho = air_density if air_density is not None else self.force_calc.air_density
+        cd = drag_coefficient if drag_coefficient is not None else self.force_calc.drag_coefficient
+        
+        return float(w_x), float(w_z), float(rho), float(cd)
+
     def simulate(self, v0, launch_angle_deg, azimuth_deg, 
                  wind_speed=0, wind_direction_deg=0,
                  air_density=None, drag_coefficient=None,
-                 max_time=20.0, dt=0.01):
-        theta = np.radians(launch_angle_deg)
-        phi = np.radians(azimuth_deg)
-        wind_phi = np.radians(wind_direction_deg)
-        
-        vx0 = v0 * np.cos(theta) * np.cos(phi)
-        vy0 = v0 * np.sin(theta)
-        vz0 = v0 * np.cos(theta) * np.sin(phi)
+                 max_time=MAX_FLIGHT_TIME,
+                 dt=SIMULATION_TIME_STEP):
+        theta = math.radians(launch_angle_deg)
+        phi = math.radians(azimuth_deg)
         
-        initial_state = [0.0, 0.0, 0.0, vx0, vy0, vz0]
+        w_x, w_z, rho, cd = self.resolve_environment(
+            wind_speed, wind_direction_deg, air_density, drag_coefficient
+        )
         
-        w_x = wind_speed * np.cos(wind_phi)
-        w_z = wind_speed * np.sin(wind_phi)
-        wind_vec = np.array([w_x, 0, w_z])
+        t, x, y, z, vx, vy, vz = simulate_rk4(
+            float(v0), float(theta), float(phi),
+            w_x, w_z, rho, cd,
+            float(self.area), float(self.mass), EARTH_GRAVITY,
+            float(dt), float(max_time)
+        )
         
-        def derivatives(t, state):
-            x, y, z, vx, vy, vz = state
-            
-            v_vec = np.array([vx, vy, vz])
-            rel_v = v_vec - wind_vec
-            rel_v_mag = np.linalg.norm(rel_v)
-            
-            if rel_v_mag > 0:
-                drag_force_mag = self.force_calc.calculate_drag_force(
-                    rel_v_mag, 
-                    self.area,
-                    air_density=air_density,
-                    drag_coefficient=drag_coefficient
-                )
-                drag_vec = -drag_force_mag * (rel_v / rel_v_mag)
-            else:
-                drag_vec = np.zeros(3)
-                
-            ax = drag_vec[0] / self.mass
-            ay = -EARTH_GRAVITY + drag_vec[1] / self.mass
-            az = drag_vec[2] / self.mass
-            
-            return [vx, vy, vz, ax, ay, az]
+        return {
+            "time": t,
+            "x": x,
+            "y": y,
+            "z": z,
+            "vx": vx,
+            "vy": vy,
+            "vz": vz
+        }
 
-        def ground_event(t, state):
-            return state[1]
-        ground_event.terminal = True
-        ground_event.direction = -1
+    def simulate_batch(self, v0, launch_angle_deg, azimuth_deg,
+                       wind_speed=0, wind_direction_deg=0,
+                       air_density=None, drag_coefficient=None,
+                       max_time=MAX_FLIGHT_TIME,
+                       dt=SIMULATION_TIME_STEP):
+        """Landing (x, z) for each launch in the broadcast v0/angle arrays.
 
-        t_eval = np.arange(0, max_time, dt)
+        Any of v0, launch_angle_deg and azimuth_deg may be a scalar, so a
+        sweep over speed, elevation or azimuth is one call.
+        """
+        # Imported here so the AOT-built server never loads the JIT kernels.
+        from app.physics._integrator import simulate_batch_parallel
 
-        sol = solve_ivp(
-            derivatives, 
-            [0, max_time], 
-            initial_state, 
-            events=ground_event,
-            t_eval=t_eval,
-            rtol=1e-6
+        v0, theta, phi = (
+            np.array(a, dtype=np.float64).ravel()
+            for a in np.broadcast_arrays(
+                v0, np.radians(launch_angle_deg), np.radians(azimuth_deg)
+            )
         )
         
-        return {
-            "time": sol.t,
-            "x": sol.y[0],
-            "y": sol.y[1],
-            "z": sol.y[2],
-            "vx": sol.y[3],
-            "vy": sol.y[4],
-            "vz": sol.y[5]
-        }
+        w_x, w_z, rho, cd = self.resolve_environment(
+            wind_speed, wind_direction_deg, air_density, drag_coefficient
+        )
+        
+        return simulate_batch_parallel(
+            v0, theta, phi,
+            w_x, w_z, rho, cd,
+            float(self.area), float(self.mass), EARTH_GRAVITY,
+            float(dt), float(max_time)
+        )
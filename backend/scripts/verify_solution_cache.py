@@ -0,0 +1,47 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.physics.solver import Solver
+import numpy as np
+
+def landing_miss(solver, solution, target, env):
+    sim = solver.traj_calc.simulate(
+        v0=solution['velocity'],
+        launch_angle_deg=solution['launch_angle'],
+        azimuth_deg=solution['azimuth_angle'],
+        air_density=env.get('air_density'),
+        drag_coefficient=env.get('drag_coefficient')
+    )
+    return np.hypot(sim['x'][-1] - target[0], sim['z'][-1] - target[2])
+
+def verify():
+    # Each pair rounds to the same 2-decimal value, but the second request
+    # must still get a solution that hits under its own physics.
+    target = (120, 0, 0)
+    pairs = [
+        ({'drag_coefficient': 0.465}, {'drag_coefficient': 0.474}),
+        ({'air_density': 1.195}, {'air_density': 1.2049}),
+    ]
+    failures = 0
+
+    for first_env, second_env in pairs:
+        with Solver() as solver:
+            solver.find_optimal_trajectory(target, spring_constant=500, env_params=first_env)
+            solution = solver.find_optimal_trajectory(target, spring_constant=500, env_params=second_env)
+            miss = landing_miss(solver, solution, target, second_env)
+        # Fresh fits land within millimetres, well inside this bound.
+        ok = miss < 0.05
+        print(f"{first_env} then {second_env}: miss {miss:.4f} m"
+              f"{'' if ok else '  <-- STALE CACHE HIT'}")
+        if not ok:
+            failures += 1
+
+    if failures:
+        print(f"\nFAILURE: {failures} requests got a solution cached for different physics.")
+        sys.exit(1)
+    print("\nSUCCESS: Cached solutions are not shared across different physics.")
+
+if __name__ == "__main__":
+    verify()
@@ -0,0 +1,31 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import orjson
+import numpy as np
+from app.api.endpoints import calculate_trajectory, CalculationRequest
+
+def verify():
+    # A negative spring constant has no real pullback; the request must still
+    # succeed and report it as null rather than failing with a server error.
+    request = CalculationRequest(
+        target={'x': 40.0, 'y': 0.0, 'z': 10.0},
+        spring_constant=-500.0
+    )
+
+    with np.errstate(invalid='ignore'):
+        response = calculate_trajectory(request)
+    body = orjson.loads(response.body)
+
+    print(f"Status: {response.status_code}, pullback: {body['pullback']}, "
+          f"launch angle: {body['launch_angle']}")
+
+    if response.status_code != 200 or body['pullback'] is not None:
+        print("\nFAILURE: Negative spring constant did not return a null pullback.")
+        sys.exit(1)
+    print("\nSUCCESS: Negative spring constant returns a null pullback.")
+
+if __name__ == "__main__":
+    verify()
@@ -0,0 +1,47 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.physics.solver import Solver
+import numpy as np
+
+def describe(solution):
+    if solution is None:
+        return "no solution"
+    return f"{solution['launch_angle']} deg @ {solution['velocity']:.2f} m/s"
+
+def verify():
+    # Drag a target across bearing 180 deg so each solve warm-starts from a
+    # previous solution on the other side of the -x axis.
+    solver = Solver()
+    distance = 30.0
+    failures = 0
+
+    for bearing in (178.0, 179.0, 179.5, 180.5, 181.0, 182.0, 179.0):
+        rad = np.radians(bearing)
+        target = (distance * np.cos(rad), 0, distance * np.sin(rad))
+
+        warm = solver.find_optimal_trajectory(target, spring_constant=500)
+        with Solver() as fresh_solver:
+            fresh = fresh_solver.find_optimal_trajectory(target, spring_constant=500)
+
+        ok = (warm is not None and fresh is not None
+              and warm['error'] < 0.5
+              and warm['launch_angle'] == fresh['launch_angle']
+              and abs(warm['velocity'] - fresh['velocity']) < 0.05)
+
+        print(f"Bearing {bearing:6.1f}: warm {describe(warm)}, "
+              f"fresh {describe(fresh)}{'' if ok else '  <-- MISMATCH'}")
+        if not ok:
+            failures += 1
+
+    solver.close()
+
+    if failures:
+        print(f"\nFAILURE: {failures} warm-started solves disagree with a fresh solver.")
+        sys.exit(1)
+    print("\nSUCCESS: Warm starts match fresh solves across the -x axis.")
+
+if __name__ == "__main__":
+    verify()